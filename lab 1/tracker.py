@@ -5,80 +5,789 @@ Date: 7/10/2025
 Course: Programming for Problem Solving using Python
 """
 
+import argparse
+import csv
 import datetime
+import json
+import math
+import re
+import sqlite3
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
 
-# Welcome message
-print("========================================")
-print("      Welcome to Daily Calorie Tracker")
-print("========================================")
-print("This tool helps you track your daily calorie intake,")
-print("compare it with your daily limit, and save the session log.\n")
+import numpy as np
 
-# Input & Data Collection
-meals = []
-calories = []
+DEFAULT_DAILY_LIMIT = 2000.0
+DEFAULT_USER = "default"
+STORE_FILE = "calorie_log.db"
 
-num_meals = int(input("How many u have taken today? "))
-
-for i in range(num_meals):
-    print(f"\nEnter details for Meal {i + 1}:")
-    meal_name = input("Meal Name (e.g., Breakfast, Lunch, Snack): ")
-    calorie_amount = float(input("Calories for this meal: "))
-    
-    meals.append(meal_name)
-    calories.append(calorie_amount)
 
 # Calorie Calculations
-total_calories = sum(calories)
-average_calories = total_calories / len(calories)
+def calculate_totals(calories):
+    total_calories = sum(calories)
+    average_calories = total_calories / len(calories) if calories else 0
+    return total_calories, average_calories
 
-daily_limit = float(input("\nEnter your daily calorie limit: "))
 
 # Exceed Limit Warning System
-if total_calories > daily_limit:
-    status_message = "⚠️  You have exceeded your daily calorie limit!"
-else:
-    status_message = "✅ Great job! You are within your daily calorie limit."
+def limit_status(total_calories, daily_limit):
+    if total_calories > daily_limit:
+        return "⚠️  You have exceeded your daily calorie limit!"
+    return "✅ Great job! You are within your daily calorie limit."
+
 
 # Neatly Formatted Output
-print("\n\n========================================")
-print("         Daily Calorie Summary")
-print("========================================")
-print(f"{'Meal Name':<15}{'Calories'}")
-print("----------------------------------------")
-
-for i in range(len(meals)):
-    print(f"{meals[i]:<15}{calories[i]}")
-
-print("----------------------------------------")
-print(f"{'Total:':<15}{total_calories}")
-print(f"{'Average:':<15}{average_calories:.2f}")
-print("----------------------------------------")
-print(status_message)
-print("========================================\n")
-
-# Save Session Log to File
-save = input("Would you like to save this session report to a file? (yes/no): ").strip().lower()
-
-if save == "yes":
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    filename = "calorie_log.txt"
-
-    with open(filename, "a") as file:
-        file.write("========================================\n")
-        file.write(f"Session Date & Time: {timestamp}\n")
-        file.write("----------------------------------------\n")
-        for i in range(len(meals)):
-            file.write(f"{meals[i]:<15}{calories[i]}\n")
-        file.write("----------------------------------------\n")
-        file.write(f"Total Calories: {total_calories}\n")
-        file.write(f"Average Calories: {average_calories:.2f}\n")
-        file.write(f"Daily Limit: {daily_limit}\n")
-        file.write(f"Status: {status_message}\n")
-        file.write("========================================\n\n")
-
-    print(f"✅ Session saved successfully as '{filename}'.")
-else:
-    print("Session not saved. Thank you for using the tracker!")
-
-print("\nThank you for using the Daily Calorie Tracker! Stay healthy 😄")
+def print_summary(meals, calories, total_calories, average_calories, status_message):
+    print("\n\n========================================")
+    print("         Daily Calorie Summary")
+    print("========================================")
+    print(f"{'Meal Name':<15}{'Calories'}")
+    print("----------------------------------------")
+
+    for i in range(len(meals)):
+        print(f"{meals[i]:<15}{calories[i]}")
+
+    print("----------------------------------------")
+    print(f"{'Total:':<15}{total_calories}")
+    print(f"{'Average:':<15}{average_calories:.2f}")
+    print("----------------------------------------")
+    print(status_message)
+    print("========================================\n")
+
+
+# ----------------------------------------
+# Batch Processing of Meal Logs
+# ----------------------------------------
+# A meal log is a CSV file (columns: user, date, meal, calories) or a
+# JSON-lines file (.jsonl) with the same keys, one meal per line.
+def parse_meal_row(row):
+    """(user, ISO date, meal, calories) from one log row; raises ValueError."""
+    if not isinstance(row, dict):
+        raise ValueError("expected an object with user, date, meal and calories")
+    user = str(row.get("user") or "")
+    if not user.strip():
+        raise ValueError("missing user")
+    try:
+        day = datetime.date.fromisoformat(str(row.get("date") or "").strip())
+    except ValueError:
+        raise ValueError(f"date {row.get('date')!r} is not YYYY-MM-DD") from None
+    try:
+        calories = float(row.get("calories"))
+    except (TypeError, ValueError):
+        raise ValueError(f"calories {row.get('calories')!r} is not a number") from None
+    if not math.isfinite(calories):
+        raise ValueError(f"calories {row.get('calories')!r} is not a number")
+    return user, day.isoformat(), row.get("meal") or "", calories
+
+
+def read_meal_log(path):
+    """Load one meal log; a bad row raises ValueError naming the file and line."""
+    users, dates, meals, calories = [], [], [], []
+    path = Path(path)
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        if path.suffix == ".jsonl":
+            rows = ((n, line) for n, line in enumerate(file, 1) if line.strip())
+        else:
+            reader = csv.DictReader(file)
+            rows = ((reader.line_num, row) for row in reader)
+        for n, row in rows:
+            try:
+                if path.suffix == ".jsonl":
+                    row = json.loads(row)
+                user, day, meal, cal = parse_meal_row(row)
+            except ValueError as e:
+                raise ValueError(f"{path}:{n}: {e}") from None
+            users.append(user)
+            dates.append(day)
+            meals.append(meal)
+            calories.append(cal)
+    return {
+        "user": np.array(users, dtype=str),
+        "date": np.array(dates, dtype="datetime64[D]"),
+        "meal": np.array(meals, dtype=object),
+        "calories": np.array(calories, dtype=np.float64),
+    }
+
+
+def merge_meal_logs(logs):
+    return {key: np.concatenate([log[key] for log in logs]) for key in logs[0]}
+
+
+def load_meal_logs(paths):
+    return merge_meal_logs([read_meal_log(p) for p in paths])
+
+
+def daily_summary(entries, daily_limit=DEFAULT_DAILY_LIMIT, user_limits=None):
+    """Group meals by (user, day) in one vectorized pass.
+
+    Returns one array per column, one row per user-day, sorted by user
+    then date. user_limits maps a user to their own daily limit.
+    """
+    users, user_idx = np.unique(entries["user"], return_inverse=True)
+    days = entries["date"].astype(np.int64)
+    first_day = days.min() if len(days) else 0
+    span = int(days.max() - first_day + 1) if len(days) else 1
+    keys, group = np.unique(user_idx * span + (days - first_day), return_inverse=True)
+
+    totals = np.bincount(group, weights=entries["calories"], minlength=len(keys))
+    meal_counts = np.bincount(group, minlength=len(keys))
+    group_user = keys // span
+    limits = np.full(len(users), daily_limit, dtype=np.float64)
+    for i, user in enumerate(users):
+        if user_limits and user in user_limits:
+            limits[i] = user_limits[user]
+
+    return {
+        "user": users[group_user],
+        "date": (keys % span + first_day).astype("datetime64[D]"),
+        "meals": meal_counts,
+        "total_calories": totals,
+        "average_calories": totals / meal_counts,
+        "daily_limit": limits[group_user],
+        "over_limit": totals > limits[group_user],
+    }
+
+
+def user_summary(daily):
+    """Per-user days logged, mean daily calories and days over the limit."""
+    users, idx = np.unique(daily["user"], return_inverse=True)
+    days = np.bincount(idx, minlength=len(users))
+    totals = np.bincount(idx, weights=daily["total_calories"], minlength=len(users))
+    over = np.bincount(idx, weights=daily["over_limit"], minlength=len(users))
+    return {
+        "user": users,
+        "days": days,
+        "average_daily_calories": totals / days,
+        "days_over_limit": over.astype(np.int64),
+    }
+
+
+def write_daily_summary(daily, filename):
+    columns = list(daily)
+    with open(filename, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        writer.writerows(zip(*(daily[c].astype(str).tolist() if c == "date" else daily[c].tolist()
+                               for c in columns)))
+
+
+def read_user_limits(filename):
+    with open(filename, "r", encoding="utf-8", newline="") as file:
+        return {row["user"]: float(row["limit"]) for row in csv.DictReader(file)}
+
+
+def run_batch(paths, daily_limit=DEFAULT_DAILY_LIMIT, limits_file=None, output=None, store_path=None):
+    logs = [read_meal_log(p) for p in paths]
+    entries = merge_meal_logs(logs)
+    user_limits = read_user_limits(limits_file) if limits_file else None
+    daily = daily_summary(entries, daily_limit, user_limits)
+    if store_path:
+        store = MealStore(store_path)
+        added = sum(store.add_meal_log(log, daily_limit, user_limits, source=str(Path(p).resolve()))
+                    for p, log in zip(paths, logs))
+        store.close()
+    users = user_summary(daily)
+
+    print("========================================")
+    print("      Calorie Tracker — Batch Summary")
+    print("========================================")
+    print(f"Meals: {len(entries['calories'])}  Users: {len(users['user'])}  User-days: {len(daily['user'])}")
+    print("----------------------------------------")
+    print(f"{'User':<15}{'Days':>6}{'Avg/day':>10}{'Over':>6}")
+    for user, days, avg, over in zip(users["user"], users["days"],
+                                     users["average_daily_calories"], users["days_over_limit"]):
+        print(f"{user:<15}{days:>6}{avg:>10.2f}{over:>6}")
+    print("========================================")
+
+    if output:
+        write_daily_summary(daily, output)
+        print(f"✅ Daily totals saved to '{output}'.")
+    if store_path:
+        print(f"✅ {added} meal(s) appended to '{store_path}'.")
+        skipped = len(entries["calories"]) - added
+        if skipped:
+            print(f"⚠ {skipped} meal(s) skipped: already imported from the same file.")
+    return daily
+
+
+# ----------------------------------------
+# Meal Store
+# ----------------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    logged_at TEXT NOT NULL,
+    daily_limit REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS migrated_sessions (
+    user TEXT NOT NULL,
+    logged_at TEXT NOT NULL,
+    PRIMARY KEY (user, logged_at)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meals (
+    session_id INTEGER REFERENCES sessions(id),
+    user TEXT NOT NULL,
+    date TEXT NOT NULL,
+    meal TEXT NOT NULL,
+    calories REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS meals_user_date ON meals (user, date);
+CREATE TABLE IF NOT EXISTS daily (
+    user TEXT NOT NULL,
+    date TEXT NOT NULL,
+    meals INTEGER NOT NULL,
+    total_calories REAL NOT NULL,
+    daily_limit REAL NOT NULL,
+    PRIMARY KEY (user, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS imported_logs (
+    source TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL
+);
+"""
+
+ROLLUP_SQL = """
+INSERT INTO daily (user, date, meals, total_calories, daily_limit)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (user, date) DO UPDATE SET
+    meals = meals + excluded.meals,
+    total_calories = total_calories + excluded.total_calories,
+    daily_limit = excluded.daily_limit
+"""
+
+
+class MealStore:
+    """Append-only SQLite meal history with per-day rollups.
+
+    Every meal is kept in `meals`; `daily` holds one precomputed row per
+    user and date, so range queries read at most one row per day.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self._upgrade_sessions()
+        # Called as listener(user, date, meals, calories, daily_limit) after
+        # each save_session; bulk add_meal_log imports don't notify.
+        self.listeners = []
+
+    def _upgrade_sessions(self):
+        # Older stores made (user, logged_at) unique for every session, so
+        # two saves in the same second lost one. Keep those keys as
+        # migrated sessions and rebuild the table without the constraint.
+        (sql,) = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'sessions'").fetchone()
+        if "UNIQUE" not in sql:
+            return
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO migrated_sessions SELECT user, logged_at FROM sessions")
+            self.conn.execute(
+                "CREATE TABLE sessions_new (id INTEGER PRIMARY KEY, user TEXT NOT NULL, "
+                "logged_at TEXT NOT NULL, daily_limit REAL NOT NULL)")
+            self.conn.execute("INSERT INTO sessions_new SELECT id, user, logged_at, daily_limit FROM sessions")
+            self.conn.execute("DROP TABLE sessions")
+            self.conn.execute("ALTER TABLE sessions_new RENAME TO sessions")
+
+    def close(self):
+        self.conn.close()
+
+    def save_session(self, meals, calories, daily_limit, user=DEFAULT_USER, logged_at=None,
+                     migrated=False):
+        """Store one session and return its id.
+
+        Every call adds a session. Only migrated sessions are de-duplicated:
+        with migrated=True, a (user, logged_at) already migrated returns None.
+        """
+        logged_at = logged_at or datetime.datetime.now()
+        day = logged_at.date().isoformat()
+        stamp = logged_at.isoformat(sep=" ", timespec="seconds")
+        with self.conn:
+            if migrated:
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO migrated_sessions VALUES (?, ?)", (user, stamp))
+                if not cur.rowcount:
+                    return None
+            cur = self.conn.execute(
+                "INSERT INTO sessions (user, logged_at, daily_limit) VALUES (?, ?, ?)",
+                (user, stamp, daily_limit))
+            session_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO meals VALUES (?, ?, ?, ?, ?)",
+                [(session_id, user, day, m, c) for m, c in zip(meals, calories)])
+            self.conn.execute(ROLLUP_SQL, (user, day, len(meals), sum(calories), daily_limit))
+        for listener in self.listeners:
+            listener(user, day, meals, calories, daily_limit)
+        return session_id
+
+    def add_meal_log(self, entries, daily_limit=DEFAULT_DAILY_LIMIT, user_limits=None, source=None):
+        """Bulk-insert meals loaded by read_meal_log/load_meal_logs.
+
+        With a source (e.g. the log's path), the number of rows imported
+        from it is recorded and only rows past that count are inserted, so
+        re-running a batch on a log that has grown adds just the new meals.
+        Returns the number of meals inserted.
+        """
+        with self.conn:
+            if source is not None:
+                row = self.conn.execute(
+                    "SELECT rows FROM imported_logs WHERE source = ?", (source,)).fetchone()
+                done = row[0] if row else 0
+                if done:
+                    entries = {key: col[done:] for key, col in entries.items()}
+                self.conn.execute(
+                    "INSERT INTO imported_logs VALUES (?, ?) ON CONFLICT (source) "
+                    "DO UPDATE SET rows = excluded.rows",
+                    (source, done + len(entries["calories"])))
+            users = entries["user"].tolist()
+            dates = entries["date"].astype(str).tolist()
+            if not users:
+                return 0
+            daily = daily_summary(entries, daily_limit, user_limits)
+            self.conn.executemany(
+                "INSERT INTO meals VALUES (NULL, ?, ?, ?, ?)",
+                zip(users, dates, entries["meal"].tolist(), entries["calories"].tolist()))
+            self.conn.executemany(ROLLUP_SQL, zip(
+                daily["user"].tolist(), daily["date"].astype(str).tolist(),
+                daily["meals"].tolist(), daily["total_calories"].tolist(),
+                daily["daily_limit"].tolist()))
+        return len(users)
+
+    # ---------- Queries ----------
+    def daily_rows(self, user=DEFAULT_USER, start=None, end=None):
+        """(date, meals, total, limit) per logged day, oldest first; dates inclusive."""
+        return self.conn.execute(
+            "SELECT date, meals, total_calories, daily_limit FROM daily "
+            "WHERE user = ? AND date BETWEEN ? AND ? ORDER BY date",
+            (user, str(start or "0000-01-01"), str(end or "9999-12-31"))).fetchall()
+
+    def range_totals(self, user=DEFAULT_USER, start=None, end=None):
+        days, meals, total, over = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(meals), 0), COALESCE(SUM(total_calories), 0), "
+            "COALESCE(SUM(total_calories > daily_limit), 0) FROM daily "
+            "WHERE user = ? AND date BETWEEN ? AND ?",
+            (user, str(start or "0000-01-01"), str(end or "9999-12-31"))).fetchone()
+        return {
+            "days": days,
+            "meals": meals,
+            "total_calories": total,
+            "average_daily_calories": total / days if days else 0,
+            "days_over_limit": over,
+        }
+
+    def weekly_averages(self, user=DEFAULT_USER, start=None, end=None):
+        """(week starting Monday, average daily calories over logged days)."""
+        return self.conn.execute(
+            "SELECT date(date, '-6 days', 'weekday 1') AS week, AVG(total_calories) "
+            "FROM daily WHERE user = ? AND date BETWEEN ? AND ? GROUP BY week ORDER BY week",
+            (user, str(start or "0000-01-01"), str(end or "9999-12-31"))).fetchall()
+
+
+# ----------------------------------------
+# Trend Analytics
+# ----------------------------------------
+TREND_WINDOWS = (7, 30)
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def meal_type(name):
+    return name.strip().title() or "Unnamed"
+
+
+def over_limit_runs(over):
+    """(longest length, its start index, length of the run ending at the last day)."""
+    edges = np.diff(np.concatenate(([0], over.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    if not len(starts):
+        return 0, None, 0
+    lengths = ends - starts
+    best = int(np.argmax(lengths))
+    current = int(lengths[-1]) if ends[-1] == len(over) else 0
+    return int(lengths[best]), int(starts[best]), current
+
+
+class UserTrend:
+    """One user's history as dense per-day arrays (day 0 = first logged day).
+
+    Rolling averages are mean calories over the logged days inside each
+    7/30-day window, from prefix sums in O(n). A new session only
+    refreshes the windows that contain its day; streaks are updated in
+    O(1) when a new last day is appended.
+    """
+
+    def __init__(self, days=(), totals=(), limits=()):
+        days = np.asarray(days, dtype=np.int64)
+        self.first_day = int(days.min()) if len(days) else None
+        self.n = int(days.max() - days.min() + 1) if len(days) else 0
+        size = max(self.n, 16)
+        self.totals = np.zeros(size)
+        self.limits = np.zeros(size)
+        self.logged = np.zeros(size, dtype=bool)
+        self.rolling = {w: np.zeros(size) for w in TREND_WINDOWS}
+        if len(days):
+            idx = days - self.first_day
+            self.totals[idx] = totals
+            self.limits[idx] = limits
+            self.logged[idx] = True
+        self.meal_counts = Counter()
+        self.meal_calories = Counter()
+        self._refresh_rolling(0, self.n)
+        self._refresh_streaks()
+
+    def _grow(self, n):
+        if n > len(self.totals):
+            size = max(n, 2 * len(self.totals))
+            for name in ("totals", "limits", "logged"):
+                old = getattr(self, name)
+                new = np.zeros(size, dtype=old.dtype)
+                new[:self.n] = old[:self.n]
+                setattr(self, name, new)
+            for w, old in self.rolling.items():
+                self.rolling[w] = np.zeros(size)
+                self.rolling[w][:self.n] = old[:self.n]
+        self.n = n
+
+    def _refresh_rolling(self, a, b):
+        # Recompute rolling[w][a:b] from prefix sums over [a - w + 1, b)
+        for w, out in self.rolling.items():
+            lo = max(0, a - w + 1)
+            sums = np.concatenate(([0.0], np.cumsum(self.totals[lo:b])))
+            counts = np.concatenate(([0], np.cumsum(self.logged[lo:b])))
+            i = np.arange(a, b) - lo
+            start = np.maximum(i - w + 1, 0)
+            s, c = sums[i + 1] - sums[start], counts[i + 1] - counts[start]
+            out[a:b] = np.divide(s, c, out=np.zeros(len(s)), where=c > 0)
+
+    def _refresh_streaks(self):
+        self.longest, self.longest_start, self.current = over_limit_runs(self.over_limit())
+
+    def over_limit(self):
+        return self.logged[:self.n] & (self.totals[:self.n] > self.limits[:self.n])
+
+    def add_session(self, day, meals, calories, daily_limit):
+        """Fold one saved session (day as a date ordinal) into the arrays."""
+        for meal, cal in zip(meals, calories):
+            self.meal_counts[meal_type(meal)] += 1
+            self.meal_calories[meal_type(meal)] += cal
+        if self.first_day is None:
+            self.first_day = day
+        if day < self.first_day:
+            # Backfill before the first day: rebuild with the new origin
+            idx = np.flatnonzero(self.logged[:self.n])
+            rebuilt = UserTrend(np.append(idx + self.first_day, day),
+                                np.append(self.totals[idx], sum(calories)),
+                                np.append(self.limits[idx], daily_limit))
+            rebuilt.meal_counts, rebuilt.meal_calories = self.meal_counts, self.meal_calories
+            self.__dict__.update(rebuilt.__dict__)
+            return
+        i = day - self.first_day
+        old_n = self.n
+        appended = i >= old_n
+        gap = i > old_n
+        if appended:
+            self._grow(i + 1)
+        self.totals[i] += sum(calories)
+        self.limits[i] = daily_limit
+        self.logged[i] = True
+        # Days after i (or new gap days before it) are the only windows affected
+        self._refresh_rolling(min(i, old_n), min(self.n, i + max(TREND_WINDOWS)))
+        if appended:
+            self.current = 0 if gap else self.current
+            if self.totals[i] > self.limits[i]:
+                self.current += 1
+                if self.current > self.longest:
+                    self.longest, self.longest_start = self.current, i - self.current + 1
+            else:
+                self.current = 0
+        else:
+            self._refresh_streaks()
+
+    # ---------- Reports ----------
+    def day_date(self, i):
+        return datetime.date.fromordinal(self.first_day + i)
+
+    def rolling_average(self, window=7):
+        """Latest rolling average for the window ending on the last logged day."""
+        return float(self.rolling[window][self.n - 1]) if self.n else 0.0
+
+    def rolling_series(self, window=7):
+        """(date, rolling average) for every logged day."""
+        idx = np.flatnonzero(self.logged[:self.n])
+        return [(self.day_date(i), float(self.rolling[window][i])) for i in idx.tolist()]
+
+    def streaks(self):
+        """Longest and current runs of consecutive days over the limit, as
+        (length, first date, last date); dates are None for an empty run."""
+        longest = current = (0, None, None)
+        if self.longest:
+            longest = (self.longest, self.day_date(self.longest_start),
+                       self.day_date(self.longest_start + self.longest - 1))
+        if self.current:
+            current = (self.current, self.day_date(self.n - self.current), self.day_date(self.n - 1))
+        return {"longest": longest, "current": current}
+
+    def meal_breakdown(self):
+        """(meal type, meals, calories, share of calories), largest first."""
+        total = sum(self.meal_calories.values()) or 1
+        return [(m, self.meal_counts[m], cal, cal / total)
+                for m, cal in self.meal_calories.most_common()]
+
+
+class TrendEngine:
+    """UserTrend for every user in a MealStore, kept current on each save.
+
+    Saves through the same MealStore are folded in straight away; call
+    refresh() to pick up meals written by other connections or processes.
+    start/end (inclusive) limit the trends to a date range.
+    """
+
+    def __init__(self, store, users=None, start=None, end=None):
+        self.store = store
+        self.users = users
+        self.start, self.end = start, end
+        self.trends = {}
+        self.seen = 0   # highest meals rowid folded into the trends
+        self.load(users)
+        store.listeners.append(self.on_session_saved)
+
+    def _filter(self, prefix=""):
+        where = f"{prefix}date BETWEEN ? AND ?"
+        params = (str(self.start or "0000-01-01"), str(self.end or "9999-12-31"))
+        if self.users:
+            where += f" AND {prefix}user IN ({','.join('?' * len(self.users))})"
+            params += tuple(self.users)
+        return where, params
+
+    def load(self, users=None):
+        """(Re)build trends from the store, e.g. after a bulk add_meal_log."""
+        if users is not None:
+            self.users = users
+        where, params = self._filter()
+        conn = self.store.conn
+        # One read transaction, so the rollups match the rowid watermark.
+        # Inside a caller's transaction that one is used and left open.
+        began = not conn.in_transaction
+        if began:
+            conn.execute("BEGIN")
+        try:
+            self.seen = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM meals").fetchone()[0]
+            rows = conn.execute(
+                "SELECT user, date, total_calories, daily_limit FROM daily WHERE " + where +
+                " ORDER BY user, date", params).fetchall()
+            self.trends = {}
+            if rows:
+                names, dates, totals, limits = zip(*rows)
+                names = np.array(names)
+                days = np.array(dates, dtype="datetime64[D]").astype(np.int64) + EPOCH_ORDINAL
+                cuts = np.flatnonzero(names[1:] != names[:-1]) + 1
+                for a, b in zip(np.concatenate(([0], cuts)), np.concatenate((cuts, [len(rows)]))):
+                    self.trends[str(names[a])] = UserTrend(days[a:b], totals[a:b], limits[a:b])
+            for user, meal, count, calories in conn.execute(
+                    "SELECT user, meal, COUNT(*), SUM(calories) FROM meals WHERE " + where +
+                    " GROUP BY user, meal", params):
+                trend = self.trends.get(user)
+                if trend is not None:
+                    trend.meal_counts[meal_type(meal)] += count
+                    trend.meal_calories[meal_type(meal)] += calories
+        finally:
+            if began:
+                conn.commit()
+
+    def refresh(self):
+        """Fold in meals stored since the last load/refresh; returns how many."""
+        where, params = self._filter("m.")
+        rows = self.store.conn.execute(
+            "SELECT m.rowid, m.user, m.date, m.meal, m.calories, d.daily_limit "
+            "FROM meals m JOIN daily d ON d.user = m.user AND d.date = m.date "
+            "WHERE m.rowid > ? AND " + where + " ORDER BY m.rowid",
+            (self.seen,) + params).fetchall()
+        # A session or one user-day of a bulk import is a run of rowids
+        for (user, date, daily_limit), group in groupby(rows, key=itemgetter(1, 2, 5)):
+            group = list(group)
+            trend = self.trends.setdefault(user, UserTrend())
+            trend.add_session(datetime.date.fromisoformat(date).toordinal(),
+                              [r[3] for r in group], [r[4] for r in group], daily_limit)
+        if rows:
+            self.seen = rows[-1][0]
+        return len(rows)
+
+    def on_session_saved(self, user, date, meals, calories, daily_limit):
+        self.refresh()
+
+    def trend(self, user=DEFAULT_USER):
+        return self.trends.get(user) or UserTrend()
+
+
+# Migration from the old free-text calorie_log.txt
+SESSION_RE = re.compile(r"Session Date & Time: (.+)")
+MEAL_RE = re.compile(r"(.*?)\s*(-?\d+(?:\.\d+)?)$")
+LIMIT_RE = re.compile(r"Daily Limit: (.+)")
+
+
+def parse_text_log(path):
+    """Yield (logged_at, meals, calories, daily_limit) per session block.
+
+    Meal names longer than 15 characters were written flush against the
+    calories, so a name ending in digits may lose them to the number.
+    """
+    session = None
+    in_meals = False
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.rstrip("\n")
+            match = SESSION_RE.match(line)
+            if match:
+                logged_at = datetime.datetime.strptime(match.group(1).strip(), "%Y-%m-%d %H:%M:%S")
+                session = (logged_at, [], [])
+                in_meals = False
+            elif session is None:
+                continue
+            elif line.startswith("-" * 10):
+                in_meals = not in_meals
+            elif in_meals:
+                match = MEAL_RE.match(line)
+                if match:
+                    session[1].append(match.group(1).strip())
+                    session[2].append(float(match.group(2)))
+            else:
+                match = LIMIT_RE.match(line)
+                if match:
+                    yield session[0], session[1], session[2], float(match.group(1))
+                    session = None
+
+
+def migrate_text_log(text_path, store, user=DEFAULT_USER):
+    """Import an old calorie_log.txt; sessions migrated before are skipped."""
+    imported = 0
+    for logged_at, meals, calories, daily_limit in parse_text_log(text_path):
+        if store.save_session(meals, calories, daily_limit, user, logged_at, migrated=True) is not None:
+            imported += 1
+    return imported
+
+
+# ----------------------------------------
+# Reports
+# ----------------------------------------
+def print_report(store, user, start=None, end=None):
+    totals = store.range_totals(user, start, end)
+    trend = TrendEngine(store, [user], start, end).trend(user)
+    streaks = trend.streaks()
+    print("========================================")
+    print(f"      Calorie Report: {user}")
+    print("========================================")
+    print(f"{'Days logged:':<20}{totals['days']}")
+    print(f"{'Total calories:':<20}{totals['total_calories']}")
+    print(f"{'Average per day:':<20}{totals['average_daily_calories']:.2f}")
+    print(f"{'Days over limit:':<20}{totals['days_over_limit']}")
+    print("----------------------------------------")
+    print(f"{'Week of':<15}{'Avg/day'}")
+    for week, avg in store.weekly_averages(user, start, end):
+        print(f"{week:<15}{avg:.2f}")
+    print("----------------------------------------")
+    for label in ("longest", "current"):
+        length, first, last = streaks[label]
+        span = f" ({first} to {last})" if length else ""
+        print(f"{label.title() + ' streak:':<20}{length} day(s) over limit{span}")
+    print("----------------------------------------")
+    for window in TREND_WINDOWS:
+        label = f"{window}-day average:"
+        print(f"{label:<20}{trend.rolling_average(window):.2f}")
+    print(f"{'Meal Type':<15}{'Meals':>6}{'Calories':>12}{'Share':>8}")
+    for meal, count, calories, share in trend.meal_breakdown():
+        print(f"{meal:<15}{count:>6}{calories:>12.1f}{share:>8.1%}")
+    print("========================================")
+
+
+# ----------------------------------------
+# Interactive Session
+# ----------------------------------------
+def run_interactive():
+    # Welcome message
+    print("========================================")
+    print("      Welcome to Daily Calorie Tracker")
+    print("========================================")
+    print("This tool helps you track your daily calorie intake,")
+    print("compare it with your daily limit, and save the session log.\n")
+
+    # Input & Data Collection
+    meals = []
+    calories = []
+
+    num_meals = int(input("How many u have taken today? "))
+
+    for i in range(num_meals):
+        print(f"\nEnter details for Meal {i + 1}:")
+        meal_name = input("Meal Name (e.g., Breakfast, Lunch, Snack): ")
+        calorie_amount = float(input("Calories for this meal: "))
+
+        meals.append(meal_name)
+        calories.append(calorie_amount)
+
+    total_calories, average_calories = calculate_totals(calories)
+
+    daily_limit = float(input("\nEnter your daily calorie limit: "))
+    status_message = limit_status(total_calories, daily_limit)
+
+    print_summary(meals, calories, total_calories, average_calories, status_message)
+
+    save = input("Would you like to save this session report to a file? (yes/no): ").strip().lower()
+
+    if save == "yes":
+        store = MealStore(STORE_FILE)
+        store.save_session(meals, calories, daily_limit)
+        store.close()
+        print(f"✅ Session saved successfully as '{STORE_FILE}'.")
+    else:
+        print("Session not saved. Thank you for using the tracker!")
+
+    print("\nThank you for using the Daily Calorie Tracker! Stay healthy 😄")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily Calorie Tracker")
+    parser.add_argument("--batch", nargs="+", metavar="LOG",
+                        help="summarize meal logs (.csv or .jsonl) instead of prompting")
+    parser.add_argument("--limit", type=float, default=DEFAULT_DAILY_LIMIT,
+                        help="daily calorie limit for batch mode")
+    parser.add_argument("--limits", metavar="CSV",
+                        help="per-user limits file with user,limit columns")
+    parser.add_argument("--output", metavar="CSV", help="write per-user daily totals here")
+    parser.add_argument("--store", metavar="DB", default=STORE_FILE,
+                        help="meal history database (default: %(default)s)")
+    parser.add_argument("--save", action="store_true",
+                        help="with --batch, also append the meals to the store "
+                             "(rows already imported from the same file are skipped)")
+    parser.add_argument("--migrate", metavar="TXT",
+                        help="import an old text calorie log into the store")
+    parser.add_argument("--report", metavar="USER",
+                        help="print totals, weekly averages and streaks for USER")
+    parser.add_argument("--start", metavar="YYYY-MM-DD", help="report start date")
+    parser.add_argument("--end", metavar="YYYY-MM-DD", help="report end date")
+    args = parser.parse_args()
+
+    if args.batch:
+        try:
+            run_batch(args.batch, args.limit, args.limits, args.output,
+                      args.store if args.save else None)
+        except (OSError, ValueError) as e:
+            parser.exit(1, f"❌ {e}\n")
+    elif args.migrate:
+        store = MealStore(args.store)
+        count = migrate_text_log(args.migrate, store)
+        store.close()
+        print(f"✅ Imported {count} session(s) into '{args.store}'.")
+    elif args.report:
+        store = MealStore(args.store)
+        try:
+            print_report(store, args.report, args.start, args.end)
+        finally:
+            store.close()
+    else:
+        run_interactive()
+
+
+if __name__ == "__main__":
+    main()
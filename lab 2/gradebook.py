@@ -2,14 +2,21 @@
   # Author: Anujesh Gupta
   # Date: October 2024
   # Title: GradeBook Analyzer CLI
+import argparse
+import bisect
 import csv
+import math
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 def display_menu():
       print("\nWelcome to GradeBook Analyzer!")
       print("Choose an option:")
       print("1. Manual entry of student names and marks")
       print("2. Load from CSV file")
-      print("3. Exit")
+      print("3. Stream a large CSV file (constant memory)")
+      print("4. Exit")
 
 def manual_input():
       marks = {}
@@ -27,8 +34,13 @@ def csv_input(filename):
           return {}
       with open(filename, 'r') as file:
           reader = csv.DictReader(file)
+          duplicates = 0
           for row in reader:
+              if row['Name'] in marks:
+                  duplicates += 1
               marks[row['Name']] = float(row['Marks'])
+      if duplicates:
+          print(f"Warning: {duplicates} duplicate name(s); later rows overwrote earlier ones.")
       return marks
 
 def calculate_average(marks_dict):
@@ -76,6 +88,408 @@ def pass_fail_filter(marks_dict):
       passed = [name for name, mark in marks_dict.items() if mark >= 40]
       failed = [name for name, mark in marks_dict.items() if mark < 40]
       return passed, failed
+# Array-backed core: marks live in one NumPy array and every statistic is
+# a single vectorized pass (grades via searchsorted, distribution via
+# bincount, median/percentiles via partition-based selection).
+GRADE_CUTOFFS = (60, 70, 80, 90)
+GRADE_LETTERS = ('F', 'D', 'C', 'B', 'A')
+PASS_MARK = 40
+class GradeBook:
+      def __init__(self, names, marks, cutoffs=GRADE_CUTOFFS, letters=GRADE_LETTERS, pass_mark=PASS_MARK):
+          self.names = list(names)
+          self.marks = np.asarray(marks, dtype=np.float64)
+          self.cutoffs = np.asarray(cutoffs, dtype=np.float64)
+          self.letters = np.array(letters)
+          self.pass_mark = pass_mark
+          if len(self.names) != len(self.marks):
+              raise ValueError("Names and marks must have the same length")
+          if len(self.letters) != len(self.cutoffs) + 1:
+              raise ValueError("Need exactly one more grade letter than cut-offs")
+      @classmethod
+      def from_dict(cls, marks_dict, **kwargs):
+          marks = np.fromiter(marks_dict.values(), dtype=np.float64, count=len(marks_dict))
+          return cls(marks_dict.keys(), marks, **kwargs)
+      def __len__(self):
+          return len(self.marks)
+      def average(self):
+          return float(self.marks.mean()) if len(self) else 0
+      def percentile(self, q):
+          # np.percentile selects with a partition, not a full sort
+          return float(np.percentile(self.marks, q)) if len(self) else 0
+      def median(self):
+          n = len(self)
+          if not n:
+              return 0
+          k = n // 2
+          if n % 2:
+              return float(np.partition(self.marks, k)[k])
+          lo, hi = np.partition(self.marks, [k - 1, k])[k - 1:k + 1]
+          return float((lo + hi) / 2)
+      def max_score(self):
+          return float(self.marks.max()) if len(self) else 0
+      def min_score(self):
+          return float(self.marks.min()) if len(self) else 0
+      def grade_indices(self):
+          # Index into self.letters: 0 = below the first cut-off
+          return np.searchsorted(self.cutoffs, self.marks, side='right')
+      def grades(self):
+          return self.letters[self.grade_indices()]
+      def grades_dict(self):
+          return dict(zip(self.names, self.grades().tolist()))
+      def distribution(self):
+          counts = np.bincount(self.grade_indices(), minlength=len(self.letters))
+          # Highest grade first, like grade_distribution()
+          return {letter: int(c) for letter, c in zip(self.letters[::-1].tolist(), counts[::-1])}
+      def pass_fail(self):
+          passed = self.marks >= self.pass_mark
+          names = self.names
+          return ([names[i] for i in np.flatnonzero(passed).tolist()],
+                  [names[i] for i in np.flatnonzero(~passed).tolist()])
+def benchmark(n=10_000_000, seed=0):
+      rng = np.random.default_rng(seed)
+      marks = rng.uniform(0, 100, n).round(1)
+      names = [f"S{i:08d}" for i in range(n)]
+      marks_dict = dict(zip(names, marks.tolist()))
+      def run(label, fn):
+          start = time.perf_counter()
+          fn()
+          elapsed = time.perf_counter() - start
+          print(f"{label:<12}{elapsed:>10.3f}s")
+          return elapsed
+      def dict_based():
+          calculate_average(marks_dict)
+          calculate_median(marks_dict)
+          find_max_score(marks_dict)
+          find_min_score(marks_dict)
+          grade_distribution(assign_grades(marks_dict))
+          pass_fail_filter(marks_dict)
+      def array_based():
+          book = GradeBook(names, marks)
+          book.average()
+          book.median()
+          book.max_score()
+          book.min_score()
+          book.distribution()
+          book.pass_fail()
+      print(f"Benchmark: {n} students")
+      t_dict = run("dict", dict_based)
+      t_array = run("array", array_based)
+      print(f"Speedup: {t_dict / t_array:.1f}x")
+# Streaming mode: the CSV is read in chunks and only running aggregates are
+# kept, so memory does not grow with the file. Every row counts, even if a
+# name repeats.
+class QuantileSketch:
+      # Fixed-width histogram over [lo, hi]. A quantile is reported as the
+      # midpoint of the bin holding that rank, so for marks inside [lo, hi]
+      # it is within half a bin width ((hi - lo) / bins / 2, i.e. 0.005 marks
+      # by default) of the exact value. Marks outside the range fall into
+      # the edge bins.
+      def __init__(self, lo=0.0, hi=100.0, bins=10_000):
+          self.lo = lo
+          self.width = (hi - lo) / bins
+          self.counts = np.zeros(bins, dtype=np.int64)
+      def merge(self, other):
+          self.counts += other.counts
+      def update(self, values):
+          idx = np.clip(((values - self.lo) // self.width).astype(np.int64), 0, len(self.counts) - 1)
+          self.counts += np.bincount(idx, minlength=len(self.counts))
+      def value_at_rank(self, rank):
+          # rank is 0-based
+          i = int(np.searchsorted(np.cumsum(self.counts), rank, side='right'))
+          return self.lo + (i + 0.5) * self.width
+      def quantile(self, q):
+          n = int(self.counts.sum())
+          if not n:
+              return 0
+          pos = q * (n - 1)
+          lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+          return (self.value_at_rank(lo) + self.value_at_rank(hi)) / 2 if lo != hi else self.value_at_rank(lo)
+class StreamingGradeStats:
+      def __init__(self, cutoffs=GRADE_CUTOFFS, letters=GRADE_LETTERS, pass_mark=PASS_MARK):
+          self.cutoffs = cutoffs
+          self.letters = letters
+          self.pass_mark = pass_mark
+          self.count = 0
+          self.total = 0.0
+          self.min = float('inf')
+          self.max = float('-inf')
+          self.histogram = np.zeros(len(letters), dtype=np.int64)
+          self.passed = 0
+          self.sketch = QuantileSketch()
+      def update(self, chunk):
+          # chunk is a GradeBook holding one slice of the file
+          if not len(chunk):
+              return
+          self.count += len(chunk)
+          self.total += float(chunk.marks.sum())
+          self.min = min(self.min, chunk.min_score())
+          self.max = max(self.max, chunk.max_score())
+          self.histogram += np.bincount(chunk.grade_indices(), minlength=len(self.letters))
+          self.passed += int(np.count_nonzero(chunk.marks >= self.pass_mark))
+          self.sketch.update(chunk.marks)
+      def merge(self, other):
+          # Every field is a sum, min or max, so merged totals are exact
+          self.count += other.count
+          self.total += other.total
+          self.min = min(self.min, other.min)
+          self.max = max(self.max, other.max)
+          self.histogram += other.histogram
+          self.passed += other.passed
+          self.sketch.merge(other.sketch)
+      def average(self):
+          return self.total / self.count if self.count else 0
+      def median(self):
+          return self.sketch.quantile(0.5)
+      def max_score(self):
+          return self.max if self.count else 0
+      def min_score(self):
+          return self.min if self.count else 0
+      def failed(self):
+          return self.count - self.passed
+      def distribution(self):
+          return {letter: int(c) for letter, c in zip(self.letters[::-1], self.histogram[::-1])}
+def read_csv_chunks(filename, chunk_size=100_000):
+      with open(filename, 'r', newline='') as file:
+          reader = csv.reader(file)
+          header = next(reader, None)
+          if header is None:
+              return
+          if 'Name' not in header or 'Marks' not in header:
+              raise ValueError("CSV must have Name and Marks columns")
+          name_col, mark_col = header.index('Name'), header.index('Marks')
+          width = max(name_col, mark_col) + 1
+          while True:
+              names, marks = [], []
+              for row in reader:
+                  # Blank lines come back as [], DictReader skips them too
+                  if not row:
+                      continue
+                  if len(row) < width:
+                      raise ValueError(f"Line {reader.line_num}: missing Name or Marks value")
+                  names.append(row[name_col])
+                  marks.append(row[mark_col])
+                  if len(names) == chunk_size:
+                      break
+              if not names:
+                  return
+              yield names, np.array(marks, dtype=np.float64)
+def stream_csv(filename, output=None, chunk_size=100_000, cutoffs=GRADE_CUTOFFS, letters=GRADE_LETTERS, pass_mark=PASS_MARK):
+      if output and os.path.exists(output) and os.path.samefile(filename, output):
+          # Opening the output would truncate the input before it is read
+          raise ValueError("the output file must be different from the input CSV")
+      stats = StreamingGradeStats(cutoffs, letters, pass_mark)
+      out = open(output, 'w', newline='') if output else None
+      try:
+          writer = csv.writer(out) if out else None
+          if writer:
+              writer.writerow(["Name", "Marks", "Grade"])
+          for names, marks in read_csv_chunks(filename, chunk_size):
+              chunk = GradeBook(names, marks, cutoffs, letters, pass_mark)
+              stats.update(chunk)
+              if writer:
+                  writer.writerows(zip(names, marks.tolist(), chunk.grades().tolist()))
+      finally:
+          if out:
+              out.close()
+      return stats
+# Batch mode: one worker process per course file, each returning its
+# StreamingGradeStats; the institution-wide figures come from merging those.
+def analyze_course(filename):
+      return stream_csv(filename)
+def course_summary_row(course, stats):
+      return ([course, stats.count, round(stats.average(), 2), round(stats.median(), 2),
+               stats.max_score(), stats.min_score()]
+              + list(stats.distribution().values()) + [stats.passed, stats.failed()])
+def batch_analyze(directory, summary_file=None, workers=None):
+      files = sorted(f for f in os.listdir(directory) if f.lower().endswith('.csv'))
+      paths = [os.path.join(directory, f) for f in files]
+      overall = StreamingGradeStats()
+      rows = []
+      with ProcessPoolExecutor(max_workers=workers) as pool:
+          futures = [pool.submit(analyze_course, p) for p in paths]
+          for name, future in zip(files, futures):
+              try:
+                  stats = future.result()
+              except Exception as e:
+                  # One unreadable course must not abort the whole batch
+                  print(f"Skipped {name}: {type(e).__name__}: {e}")
+                  continue
+              overall.merge(stats)
+              rows.append(course_summary_row(os.path.splitext(name)[0], stats))
+      rows.append(course_summary_row("ALL", overall))
+      header = ["Course", "Students", "Average", "Median", "Max", "Min"] + list(overall.distribution()) + ["Passed", "Failed"]
+      print("\t".join(header))
+      print("-" * 100)
+      for row in rows:
+          print("\t".join(str(v) for v in row))
+      if summary_file:
+          with open(summary_file, 'w', newline='') as file:
+              writer = csv.writer(file)
+              writer.writerow(header)
+              writer.writerows(rows)
+          print(f"Summary exported to {summary_file}")
+      return overall
+# Rank index: students sorted by (-mark, name) in two parallel lists, so
+# rank/percentile/top-k are bisects or slices and a mark change is one
+# delete plus one insert instead of a full re-sort.
+class RankIndex:
+      def __init__(self, marks_dict):
+          self.marks = dict(marks_dict)
+          self._entries = sorted((-m, name) for name, m in self.marks.items())
+          self._neg = [e[0] for e in self._entries]
+      @classmethod
+      def from_gradebook(cls, book):
+          return cls(zip(book.names, book.marks.tolist()))
+      def __len__(self):
+          return len(self._entries)
+      def __contains__(self, name):
+          return name in self.marks
+      def mark_of(self, name):
+          return self.marks[name]
+      def set_mark(self, name, mark):
+          if name in self.marks:
+              self.remove(name)
+          key = (-mark, name)
+          i = bisect.bisect_left(self._entries, key)
+          self._entries.insert(i, key)
+          self._neg.insert(i, -mark)
+          self.marks[name] = mark
+      def remove(self, name):
+          key = (-self.marks.pop(name), name)
+          i = bisect.bisect_left(self._entries, key)
+          del self._entries[i]
+          del self._neg[i]
+      def rank(self, name):
+          # Competition ranking: ties share the best rank ("1, 2, 2, 4")
+          return bisect.bisect_left(self._neg, -self.marks[name]) + 1
+      def percentile_of_mark(self, mark):
+          # Percentile rank: share below, counting ties as half
+          n = len(self)
+          if not n:
+              return 0
+          higher = bisect.bisect_left(self._neg, -mark)
+          at_or_higher = bisect.bisect_right(self._neg, -mark)
+          below = n - at_or_higher
+          return 100 * (below + 0.5 * (at_or_higher - higher)) / n
+      def percentile_of(self, name):
+          return self.percentile_of_mark(self.marks[name])
+      def top(self, k):
+          return [(name, -neg) for neg, name in self._entries[:k]]
+      def cutoff_for_top(self, fraction):
+          # Lowest mark still inside the top `fraction` of students
+          if not len(self):
+              return 0
+          k = max(1, math.ceil(fraction * len(self)))
+          return -self._neg[min(k, len(self)) - 1]
+def print_ranking(rank_index, k=10):
+      print(f"\nTop {k}:")
+      print("Rank\tName\tMarks")
+      print("-" * 25)
+      for name, mark in rank_index.top(k):
+          print(f"{rank_index.rank(name)}\t{name}\t{mark}")
+def export_ranking_csv(rank_index, filename="output_ranking.csv"):
+      with open(filename, 'w', newline='') as file:
+          writer = csv.writer(file)
+          writer.writerow(["Rank", "Name", "Marks", "Percentile"])
+          for name, mark in rank_index.top(len(rank_index)):
+              writer.writerow([rank_index.rank(name), name, mark, round(rank_index.percentile_of_mark(mark), 2)])
+      print(f"Ranking exported to {filename}")
+# Weighted grading: per-component marks (each out of 100) sit in a
+# column-major matrix and the total is the weighted average of a row.
+# Editing one student or one component only recomputes the affected
+# totals and patches the grade counts and running sums.
+class WeightedGradeBook:
+      def __init__(self, names, components, marks, weights, cutoffs=GRADE_CUTOFFS, letters=GRADE_LETTERS, pass_mark=PASS_MARK):
+          self.names = list(names)
+          self.components = list(components)
+          self.matrix = np.asfortranarray(marks, dtype=np.float64)
+          if self.matrix.shape != (len(self.names), len(self.components)):
+              raise ValueError("Marks must have one row per student and one column per component")
+          if len(set(self.names)) != len(self.names):
+              raise ValueError("Student names must be unique")
+          self.cutoffs = np.asarray(cutoffs, dtype=np.float64)
+          self.letters = np.array(letters)
+          self.pass_mark = pass_mark
+          self._row = {name: i for i, name in enumerate(self.names)}
+          self._col = {c: j for j, c in enumerate(self.components)}
+          self.set_weights(weights)
+      @classmethod
+      def from_csv(cls, filename, weights, **kwargs):
+          # weights: {column name: weight}; the CSV needs a Name column plus those
+          with open(filename, 'r', newline='') as file:
+              rows = list(csv.DictReader(file))
+          components = list(weights)
+          marks = np.array([[float(row[c]) for c in components] for row in rows], dtype=np.float64).reshape(len(rows), len(components))
+          return cls([row['Name'] for row in rows], components, marks, [weights[c] for c in components], **kwargs)
+      def __len__(self):
+          return len(self.names)
+      def set_weights(self, weights):
+          w = np.asarray(weights, dtype=np.float64)
+          if w.shape != (len(self.components),) or w.sum() <= 0 or (w < 0).any():
+              raise ValueError("Need one non-negative weight per component")
+          self.weights = w / w.sum()
+          self._recompute_all()
+      def _recompute_all(self):
+          self.totals = self.matrix @ self.weights
+          self.grade_idx = np.searchsorted(self.cutoffs, self.totals, side='right')
+          self.counts = np.bincount(self.grade_idx, minlength=len(self.letters))
+          self.total_sum = float(self.totals.sum())
+          self.passed = int(np.count_nonzero(self.totals >= self.pass_mark))
+          self._refresh_extremes()
+      def _refresh_extremes(self):
+          self.min = float(self.totals.min()) if len(self) else 0
+          self.max = float(self.totals.max()) if len(self) else 0
+          self._median = None
+      def _update_rows(self, rows):
+          old = self.totals[rows]
+          new = self.matrix[rows] @ self.weights
+          old_idx = self.grade_idx[rows]
+          new_idx = np.searchsorted(self.cutoffs, new, side='right')
+          self.totals[rows] = new
+          self.grade_idx[rows] = new_idx
+          n = len(self.letters)
+          self.counts += np.bincount(new_idx, minlength=n) - np.bincount(old_idx, minlength=n)
+          self.total_sum += float(new.sum() - old.sum())
+          self.passed += int(np.count_nonzero(new >= self.pass_mark)) - int(np.count_nonzero(old >= self.pass_mark))
+          # Extremes only need a rescan when a current min/max moved inward
+          if (old <= self.min).any() or (old >= self.max).any():
+              self._refresh_extremes()
+          else:
+              self.min = min(self.min, float(new.min()))
+              self.max = max(self.max, float(new.max()))
+              self._median = None
+      def set_mark(self, name, component, mark):
+          i, j = self._row[name], self._col[component]
+          self.matrix[i, j] = mark
+          self._update_rows(np.array([i]))
+      def set_component(self, component, marks):
+          j = self._col[component]
+          marks = np.asarray(marks, dtype=np.float64)
+          rows = np.flatnonzero(self.matrix[:, j] != marks)
+          self.matrix[:, j] = marks
+          if len(rows):
+              self._update_rows(rows)
+      def total_of(self, name):
+          return float(self.totals[self._row[name]])
+      def grade_of(self, name):
+          return str(self.letters[self.grade_idx[self._row[name]]])
+      def average(self):
+          return self.total_sum / len(self) if len(self) else 0
+      def median(self):
+          if self._median is None:
+              self._median = GradeBook(self.names, self.totals).median()
+          return self._median
+      def max_score(self):
+          return self.max
+      def min_score(self):
+          return self.min
+      def distribution(self):
+          return {letter: int(c) for letter, c in zip(self.letters[::-1].tolist(), self.counts[::-1])}
+      def failed(self):
+          return len(self) - self.passed
+      def gradebook(self):
+          # Totals as a plain GradeBook, e.g. for RankIndex.from_gradebook
+          return GradeBook(self.names, self.totals.copy(), self.cutoffs, self.letters.tolist(), self.pass_mark)
 def print_table(marks_dict, grades_dict):
       print("\nName\tMarks\tGrade")
       print("-" * 25)
@@ -91,13 +505,35 @@ def export_to_csv(marks_dict, grades_dict, filename="output_grades.csv"):
 def main():
       while True:
           display_menu()
-          choice = input("Enter choice (1/2/3): ")
+          choice = input("Enter choice (1/2/3/4): ")
           if choice == '1':
               marks = manual_input()
           elif choice == '2':
               filename = input("Enter CSV filename (e.g., grades.csv): ")
               marks = csv_input(filename)
           elif choice == '3':
+              filename = input("Enter CSV filename (e.g., grades.csv): ")
+              if not os.path.exists(filename):
+                  print(f"File {filename} not found. Please ensure it exists.")
+                  continue
+              output = input("Write graded rows to (blank to skip): ").strip()
+              try:
+                  stats = stream_csv(filename, output or None)
+              except ValueError as e:
+                  print(f"Could not read {filename}: {e}")
+                  continue
+              print(f"\nStatistics ({stats.count} rows):\nAverage: {stats.average():.2f}\nMedian: {stats.median():.2f} (approx.)\nMax: {stats.max_score()}\nMin: {stats.min_score()}")
+              print("\nGrade Distribution:")
+              for grade, count in stats.distribution().items():
+                  print(f"{grade}: {count}")
+              print(f"\nPassed: {stats.passed}\nFailed: {stats.failed()}")
+              if output:
+                  print(f"Results exported to {output}")
+              again = input("Analyze another set? (y/n): ")
+              if again.lower() != 'y':
+                  break
+              continue
+          elif choice == '4':
               print("Exiting program.")
               break
           else:
@@ -107,22 +543,24 @@ def main():
           if not marks:
               continue
 
+          book = GradeBook.from_dict(marks)
+
           # Task 3: Statistics
-          avg = calculate_average(marks)
-          med = calculate_median(marks)
-          max_s = find_max_score(marks)
-          min_s = find_min_score(marks)
+          avg = book.average()
+          med = book.median()
+          max_s = book.max_score()
+          min_s = book.min_score()
           print(f"\nStatistics:\nAverage: {avg:.2f}\nMedian: {med:.2f}\nMax: {max_s}\nMin: {min_s}")
 
           # Task 4: Grades
-          grades = assign_grades(marks)
-          dist = grade_distribution(grades)
+          grades = book.grades_dict()
+          dist = book.distribution()
           print("\nGrade Distribution:")
           for grade, count in dist.items():
               print(f"{grade}: {count}")
 
           # Task 5: Pass/Fail
-          passed, failed = pass_fail_filter(marks)
+          passed, failed = book.pass_fail()
           print(f"\nPassed ({len(passed)}): {', '.join(passed)}")
           print(f"Failed ({len(failed)}): {', '.join(failed)}")
 
@@ -139,5 +577,18 @@ def main():
           if again.lower() != 'y':
               break
 if __name__ == "__main__":
-      main()
-  
\ No newline at end of file
+      parser = argparse.ArgumentParser(description="GradeBook Analyzer CLI")
+      parser.add_argument("--batch", metavar="DIR", help="analyze every course CSV in DIR without prompts")
+      parser.add_argument("--summary", metavar="CSV", help="with --batch, also write the summary table here")
+      parser.add_argument("--workers", type=int, help="with --batch, number of worker processes")
+      parser.add_argument("--benchmark", action="store_true", help="compare dict-based and array-based statistics")
+      args = parser.parse_args()
+      if args.benchmark:
+          benchmark()
+      elif args.batch:
+          if not os.path.isdir(args.batch):
+              parser.error(f"--batch: {args.batch} is not a directory")
+          batch_analyze(args.batch, args.summary, args.workers)
+      else:
+          main()
+  
\ No newline at end of file
@@ -2,16 +2,29 @@
 # Library Inventory Manager — Single File Version
 # ---------------------------------------------------------
 
+from array import array
+from collections import Counter, OrderedDict, defaultdict
 from dataclasses import dataclass, asdict
+from datetime import date, timedelta
+from itertools import islice
 from pathlib import Path
 from typing import List, Optional
+import asyncio
+import csv
 import json
 import logging
+import random
+import re
+import struct
+import sys
+import threading
+import time
+import unicodedata
 
 # ---------------------------------------------------------
 # Book Class
 # ---------------------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class Book:
     title: str
     author: str
@@ -40,17 +53,457 @@ class Book:
         return self.status == "available"
 
 
+# ---------------------------------------------------------
+# Binary Snapshot Format
+# ---------------------------------------------------------
+# Layout: magic, book count, then one length-prefixed UTF-8 blob per
+# column (title, author, isbn, status) with fields joined by NUL.
+# NUL is therefore not allowed inside a field (see check_text).
+SNAPSHOT_SUFFIX = ".snap"
+SNAPSHOT_MAGIC = b"LIBSNAP1"
+_FIELDS = ("title", "author", "isbn", "status")
+_SEP = "\0"
+
+
+def check_text(name: str, value: str) -> str:
+    if _SEP in value:
+        raise ValueError(f"{name} must not contain a NUL character")
+    return value
+
+
+def write_snapshot(path: Path, rows):
+    rows = list(rows)
+    blobs = []
+    for name in _FIELDS:
+        col = len(blobs)
+        text = _SEP.join(r[col] for r in rows)
+        # Refuse to write a file that would not split back the same way.
+        if rows and text.count(_SEP) != len(rows) - 1:
+            raise ValueError(f"A book {name} contains a NUL character; "
+                             "it cannot be stored in a snapshot.")
+        blobs.append(text.encode("utf-8"))
+    with open(path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(struct.pack("<I", len(rows)))
+        for blob in blobs:
+            f.write(struct.pack("<I", len(blob)))
+            f.write(blob)
+
+
+def read_snapshot(path: Path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError("Not a library snapshot file.")
+    pos = len(SNAPSHOT_MAGIC)
+    (count,) = struct.unpack_from("<I", data, pos)
+    pos += 4
+    columns = []
+    for _ in _FIELDS:
+        (size,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        text = data[pos:pos + size].decode("utf-8")
+        pos += size
+        columns.append(text.split(_SEP) if count else [])
+    if any(len(c) != count for c in columns):
+        raise ValueError("Corrupt library snapshot file.")
+    return columns
+
+
+# ---------------------------------------------------------
+# Lazy Book List
+# ---------------------------------------------------------
+class LazyBookList:
+    """List-like catalogue that builds Book objects on first access."""
+
+    def __init__(self, titles, authors, isbns, statuses):
+        self._columns = (titles, authors, isbns, statuses)
+        self._books: List[Optional[Book]] = [None] * len(titles)
+
+    def __len__(self):
+        return len(self._books)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self._books)
+        b = self._books[i]
+        if b is None:
+            b = self._books[i] = Book(*(col[i] for col in self._columns))
+        return b
+
+    def __iter__(self):
+        for i in range(len(self._books)):
+            yield self[i]
+
+    def append(self, book: Book):
+        self._books.append(book)
+
+    def extend(self, books):
+        self._books.extend(books)
+
+    def find_isbn(self, isbn: str) -> Optional[Book]:
+        # Scan the raw ISBN column so lookups don't materialize every Book
+        isbns = self._columns[2]
+        for i, b in enumerate(self._books):
+            if (b.isbn if b is not None else isbns[i]) == isbn:
+                return self[i]
+        return None
+
+    def rows(self, start: int = 0):
+        # Raw (title, author, isbn, status) tuples without building Books
+        for i in range(start, len(self._books)):
+            b = self._books[i]
+            if b is None:
+                yield tuple(col[i] for col in self._columns)
+            else:
+                yield (b.title, b.author, b.isbn, b.status)
+
+
+def _book_rows(books, start: int = 0):
+    if isinstance(books, LazyBookList):
+        return books.rows(start)
+    return ((b.title, b.author, b.isbn, b.status)
+            for b in islice(books, start, None))
+
+
+# ---------------------------------------------------------
+# Bulk Import / Export Helpers
+# ---------------------------------------------------------
+STATUSES = ("available", "issued")
+
+
+def read_records(path: Path):
+    """Yield (line number, record dict) from a CSV or JSON-lines file."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix == ".jsonl":
+            for n, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield n, json.loads(line)
+                except ValueError:
+                    yield n, None
+        else:
+            for n, row in enumerate(csv.DictReader(f), 2):
+                yield n, row
+
+
+def parse_record(item) -> Book:
+    if not isinstance(item, dict):
+        raise ValueError("malformed record")
+    fields = {}
+    for k in _FIELDS[:3]:
+        v = str(item.get(k) or "").strip()
+        if not v:
+            raise ValueError(f"missing {k}")
+        fields[k] = check_text(k, v)
+    status = str(item.get("status") or "available").strip().lower()
+    if status not in STATUSES:
+        raise ValueError(f"invalid status {status!r}")
+    return Book(status=status, **fields)
+
+
+# ---------------------------------------------------------
+# Fuzzy Search Index
+# ---------------------------------------------------------
+_WORD = re.compile(r"[^\W_]+")
+
+
+def normalize(text: str) -> str:
+    """Casefold, drop accents ("Café" -> "cafe") and keep only words."""
+    if text.isascii():
+        return " ".join(_WORD.findall(text.lower()))
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(_WORD.findall(text))
+
+
+def trigrams(text: str):
+    t = " " + normalize(text) + " "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+class FuzzyIndex:
+    """Trigram index over titles and authors with an LRU query cache.
+
+    Candidates are counted only from the rarest query trigrams (up to
+    candidate_budget postings), then the best `rescore` of them are
+    ranked by the share of query trigrams found in the title or author.
+    """
+
+    def __init__(self, books, cache_size: int = 256,
+                 candidate_budget: int = 12000, rescore: int = 100):
+        self.books = books
+        self.cache_size = cache_size
+        self.candidate_budget = candidate_budget
+        self.rescore = rescore
+        self._postings = defaultdict(lambda: array("I"))
+        self._docs = []     # (title, author) by catalogue position
+        self._cache = OrderedDict()
+        self.sync()
+
+    def sync(self):
+        """Index books appended since the last call."""
+        start = len(self._docs)
+        if start == len(self.books):
+            return
+        postings = self._postings
+        for pos, row in enumerate(_book_rows(self.books, start), start):
+            title, author = row[0], row[1]
+            self._docs.append((title, author))
+            for t in trigrams(title) | trigrams(author):
+                postings[t].append(pos)
+        self._cache.clear()
+
+    def _score(self, q, pos):
+        best = (0.0, 0.0)
+        for field in self._docs[pos]:
+            d = trigrams(field)
+            common = len(q & d)
+            best = max(best, (common / len(q), 2 * common / (len(q) + len(d))))
+        return best
+
+    def search(self, query: str, k: int = 10, min_score: float = 0.4):
+        """Return up to k (position, score) pairs, best match first."""
+        key = (normalize(query), k, min_score)
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            return hit
+
+        q = trigrams(query)
+        lists = sorted((self._postings[t] for t in q if t in self._postings), key=len)
+        counts = Counter()
+        used = 0
+        for p in lists:
+            if used and used + len(p) > self.candidate_budget:
+                break
+            counts.update(p)
+            used += len(p)
+
+        ranked = []
+        for pos, _ in counts.most_common(self.rescore):
+            coverage, dice = self._score(q, pos)
+            if coverage >= min_score:
+                ranked.append((-coverage, -dice, pos))
+        ranked.sort()
+        result = [(pos, -cov) for cov, _, pos in ranked[:k]]
+
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+
+# ---------------------------------------------------------
+# Circulation History
+# ---------------------------------------------------------
+ISSUE, RETURN = 0, 1
+_EVENT = struct.Struct("<dBH")     # timestamp, kind, ISBN byte length
+_DAY = 86400
+_EPOCH = date(1970, 1, 1)
+
+
+def _day(ts: float) -> int:
+    return int(ts // _DAY)
+
+
+def _month(day: int):
+    d = _EPOCH + timedelta(days=day)
+    return d.year, d.month
+
+
+def _next_month(day: int) -> int:
+    y, m = _month(day)
+    y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return (date(y, m, 1) - _EPOCH).days
+
+
+def _next_year(day: int) -> int:
+    return (date(_month(day)[0] + 1, 1, 1) - _EPOCH).days
+
+
+class CirculationLog:
+    """Append-only issue/return event store with precomputed aggregates.
+
+    Each event is a packed (timestamp, kind, ISBN) record. The log is
+    replayed once, on the first report, into per-ISBN counters plus
+    daily, monthly and yearly buckets. New events then update those in
+    place, so a report only combines the few buckets covering its window.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _reset(self):
+        self.issue_counts = Counter()
+        self.loan_seconds = Counter()
+        self.loans_closed = Counter()
+        self.daily_issues = defaultdict(Counter)     # day -> {isbn: issues}
+        self.monthly_issues = defaultdict(Counter)   # (year, month) -> {isbn: issues}
+        self.yearly_issues = defaultdict(Counter)    # year -> {isbn: issues}
+        # Loan time: seconds on a loan's first/last day, plus a
+        # difference array of loans covering whole days in between
+        self.partial_loan_seconds = Counter()        # day -> seconds
+        self.full_day_delta = Counter()              # day -> change in loans
+        self.open_loans = {}                         # isbn -> issue timestamp
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._reset()
+        if self.path.exists():
+            data = self.path.read_bytes()
+            pos = 0
+            while pos + _EVENT.size <= len(data):
+                ts, kind, size = _EVENT.unpack_from(data, pos)
+                pos += _EVENT.size
+                self._apply(ts, kind, data[pos:pos + size].decode("utf-8"))
+                pos += size
+        self._loaded = True
+
+    def _apply(self, ts, kind, isbn):
+        if kind == ISSUE:
+            day = _day(ts)
+            self.issue_counts[isbn] += 1
+            month = _month(day)
+            self.daily_issues[day][isbn] += 1
+            self.monthly_issues[month][isbn] += 1
+            self.yearly_issues[month[0]][isbn] += 1
+            self.open_loans[isbn] = ts
+            return
+        start = self.open_loans.pop(isbn, None)
+        if start is None:
+            return
+        self.loan_seconds[isbn] += ts - start
+        self.loans_closed[isbn] += 1
+        first, last = _day(start), _day(ts)
+        if first == last:
+            self.partial_loan_seconds[first] += ts - start
+            return
+        self.partial_loan_seconds[first] += (first + 1) * _DAY - start
+        self.partial_loan_seconds[last] += ts - last * _DAY
+        if last > first + 1:
+            self.full_day_delta[first + 1] += 1
+            self.full_day_delta[last] -= 1
+
+    def record_many(self, events):
+        """Append (kind, isbn) events stamped with the current time."""
+        ts = time.time()
+        chunks = []
+        for kind, isbn in events:
+            data = isbn.encode("utf-8")
+            chunks.append(_EVENT.pack(ts, kind, len(data)) + data)
+        if not chunks:
+            return
+        with self._lock:
+            with open(self.path, "ab") as f:
+                f.write(b"".join(chunks))
+            if self._loaded:
+                for kind, isbn in events:
+                    self._apply(ts, kind, isbn)
+
+    def record(self, kind, isbn):
+        self.record_many([(kind, isbn)])
+
+    # ---------- Reports ----------
+    @staticmethod
+    def _window(days, now):
+        # The last `days` calendar days (UTC), today included
+        now = time.time() if now is None else now
+        first = _day(now) - days + 1
+        return first, now
+
+    def issues_between(self, first_day: int, last_day: int) -> Counter:
+        """Issues per ISBN over whole days first_day..last_day."""
+        total = Counter()
+        day = first_day
+        while day <= last_day:
+            month, prev = _month(day), _month(day - 1)
+            year_end, month_end = _next_year(day), _next_month(day)
+            if prev[0] != month[0] and year_end - 1 <= last_day:
+                total.update(self.yearly_issues.get(month[0], {}))
+                day = year_end
+            elif prev != month and month_end - 1 <= last_day:
+                total.update(self.monthly_issues.get(month, {}))
+                day = month_end
+            else:
+                total.update(self.daily_issues.get(day, {}))
+                day += 1
+        return total
+
+    def _loaned_full_days(self, first_day: int, last_day: int) -> int:
+        # Walk the difference array: the loan count is constant between keys
+        total, active = 0, 0
+        keys = sorted(self.full_day_delta)
+        for d, nxt in zip(keys, keys[1:] + [last_day + 1]):
+            active += self.full_day_delta[d]
+            lo, hi = max(d, first_day), min(nxt, last_day + 1)
+            if active and hi > lo:
+                total += active * (hi - lo)
+        return total
+
+    def most_borrowed(self, k: int = 10, days: Optional[int] = None, now=None):
+        """Top-k (isbn, issues), over the last `days` days or all history."""
+        with self._lock:
+            self._ensure_loaded()
+            if days is None:
+                counts = self.issue_counts
+            else:
+                first, now = self._window(days, now)
+                counts = self.issues_between(first, _day(now))
+            return counts.most_common(k)
+
+    def average_loan_days(self, isbn: Optional[str] = None) -> float:
+        """Mean length of completed loans, for one ISBN or the whole library."""
+        with self._lock:
+            self._ensure_loaded()
+            if isbn is None:
+                seconds = sum(self.loan_seconds.values())
+                loans = sum(self.loans_closed.values())
+            else:
+                seconds, loans = self.loan_seconds[isbn], self.loans_closed[isbn]
+            return seconds / loans / _DAY if loans else 0.0
+
+    def utilization(self, n_books: int, days: int = 30, now=None) -> float:
+        """Share of catalogue book-time spent on loan in the last `days` days."""
+        if not n_books:
+            return 0.0
+        with self._lock:
+            self._ensure_loaded()
+            first, now = self._window(days, now)
+            since = first * _DAY
+            last = _day(now)
+            on_loan = sum(self.partial_loan_seconds.get(d, 0)
+                          for d in range(first, last + 1))
+            on_loan += self._loaned_full_days(first, last) * _DAY
+            for start in self.open_loans.values():
+                on_loan += max(0.0, now - max(start, since))
+            return on_loan / (n_books * (now - since))
+
+
 # ---------------------------------------------------------
 # Library Inventory Class
 # ---------------------------------------------------------
 class LibraryInventory:
-    def __init__(self, json_path: str = "catalog.json"):
+    def __init__(self, json_path: str = "catalog.json", lazy: bool = False,
+                 history: bool = True):
         self.json_path = Path(json_path)
+        self.lazy = lazy
+        self.history = (CirculationLog(self.json_path.with_suffix(".events"))
+                        if history else None)
         self.books: List[Book] = []
+        self._fuzzy: Optional[FuzzyIndex] = None
         self.load()
 
     def add_book(self, book: Book):
-        if any(b.isbn == book.isbn for b in self.books):
+        for name in _FIELDS[:3]:
+            check_text(name, getattr(book, name))
+        if self.search_by_isbn(book.isbn) is not None:
             raise ValueError("A book with this ISBN already exists!")
         self.books.append(book)
         self.save()
@@ -59,7 +512,22 @@ class LibraryInventory:
         q = query.lower().strip()
         return [b for b in self.books if q in b.title.lower()]
 
+    def fuzzy_search(self, query: str, k: int = 10, min_score: float = 0.4):
+        """Typo-tolerant title/author search.
+
+        Returns up to k (book, score) pairs, where score is the share of
+        the query's trigrams found in the title or author.
+        """
+        if self._fuzzy is None or self._fuzzy.books is not self.books:
+            self._fuzzy = FuzzyIndex(self.books)
+        else:
+            self._fuzzy.sync()
+        return [(self.books[pos], score)
+                for pos, score in self._fuzzy.search(query, k, min_score)]
+
     def search_by_isbn(self, isbn: str):
+        if isinstance(self.books, LazyBookList):
+            return self.books.find_isbn(isbn)
         for b in self.books:
             if b.isbn == isbn:
                 return b
@@ -74,6 +542,8 @@ class LibraryInventory:
             raise LookupError("Book not found.")
         res = b.issue()
         self.save()
+        if res:
+            self.record_events([(ISSUE, isbn)])
         return res
 
     def return_book(self, isbn: str):
@@ -82,11 +552,96 @@ class LibraryInventory:
             raise LookupError("Book not found.")
         res = b.return_book()
         self.save()
+        if res:
+            self.record_events([(RETURN, isbn)])
         return res
 
+    def record_events(self, events):
+        if self.history is not None:
+            self.history.record_many(events)
+
+    # ---------- Bulk Operations ----------
+    def isbn_positions(self):
+        return {row[2]: i for i, row in enumerate(_book_rows(self.books))}
+
+    def import_books(self, path: str):
+        """Add every valid, new-ISBN record from a CSV/JSON-lines file.
+
+        Returns (number added, list of (line, reason) for skipped records).
+        The catalogue is saved once at the end.
+        """
+        seen = set(self.isbn_positions())
+        new_books, skipped = [], []
+        # Nothing is added until the whole file has been read, so a read
+        # error part way through leaves the catalogue untouched.
+        for n, item in read_records(Path(path)):
+            try:
+                book = parse_record(item)
+            except ValueError as e:
+                skipped.append((n, str(e)))
+                continue
+            if book.isbn in seen:
+                skipped.append((n, f"duplicate ISBN {book.isbn}"))
+                continue
+            seen.add(book.isbn)
+            new_books.append(book)
+        if new_books:
+            self.books.extend(new_books)
+            self.save()
+        return len(new_books), skipped
+
+    def export_books(self, path: str):
+        """Stream the catalogue to a CSV or JSON-lines file."""
+        path = Path(path)
+        count = 0
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if path.suffix == ".jsonl":
+                for row in _book_rows(self.books):
+                    f.write(json.dumps(dict(zip(_FIELDS, row))) + "\n")
+                    count += 1
+            else:
+                writer = csv.writer(f)
+                writer.writerow(_FIELDS)
+                for row in _book_rows(self.books):
+                    writer.writerow(row)
+                    count += 1
+        return count
+
+    def _circulate_many(self, isbns, action, kind):
+        positions = self.isbn_positions()
+        results, events = [], []
+        for isbn in isbns:
+            i = positions.get(isbn)
+            res = None if i is None else action(self.books[i])
+            results.append(res)
+            if res:
+                events.append((kind, isbn))
+        if events:
+            self.save()
+            self.record_events(events)
+        return results
+
+    def issue_many(self, isbns):
+        """Issue several books with one save.
+
+        Returns one result per ISBN: True/False like issue_book, or None
+        if the ISBN is not in the catalogue.
+        """
+        return self._circulate_many(isbns, Book.issue, ISSUE)
+
+    def return_many(self, isbns):
+        """Return several books with one save (same results as issue_many)."""
+        return self._circulate_many(isbns, Book.return_book, RETURN)
+
     # ---------- Persistence ----------
+    def is_snapshot(self):
+        return self.json_path.suffix == SNAPSHOT_SUFFIX
+
     def save(self):
-        data = [b.to_dict() for b in self.books]
+        if self.is_snapshot():
+            write_snapshot(self.json_path, _book_rows(self.books))
+            return
+        data = [dict(zip(_FIELDS, row)) for row in _book_rows(self.books)]
         with open(self.json_path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2)
 
@@ -96,16 +651,351 @@ class LibraryInventory:
             return
 
         try:
-            with open(self.json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            self.books = [Book(**item) for item in data]
-        except Exception:
-            self.books = []
+            if self.is_snapshot():
+                columns = read_snapshot(self.json_path)
+            else:
+                with open(self.json_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if not self.lazy:
+                    self.books = [Book(**item) for item in data]
+                    return
+                columns = [[item[k] for item in data] for k in _FIELDS[:3]]
+                columns.append([item.get("status", "available") for item in data])
+            if self.lazy:
+                self.books = LazyBookList(*columns)
+            else:
+                self.books = list(map(Book, *columns))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, struct.error) as e:
+            # Don't fall back to an empty catalogue: the next save()
+            # would overwrite the file that failed to load.
+            raise ValueError(f"Could not load catalogue {self.json_path}: {e}") from e
+
+
+# ---------------------------------------------------------
+# Concurrent Circulation Service
+# ---------------------------------------------------------
+class CirculationService:
+    """Thread-safe issue/return layer for several front desks.
+
+    Each ISBN has its own lock, so the check-then-set in Book.issue /
+    Book.return_book can't interleave for the same book. Changes are
+    written back by flush() instead of saving on every call.
+
+    Books added through the service are indexed straight away; books
+    appended to the inventory directly (add_book, import_books) are
+    picked up the first time their ISBN is looked up.
+    """
+
+    def __init__(self, inventory: LibraryInventory):
+        self.inventory = inventory
+        self._positions = inventory.isbn_positions()
+        self._indexed = len(inventory.books)
+        self._locks = {}
+        self._guard = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+
+    def _lock_for(self, isbn: str):
+        with self._guard:
+            lock = self._locks.get(isbn)
+            if lock is None:
+                lock = self._locks[isbn] = threading.Lock()
+            return lock
+
+    def _index_new_books(self):
+        # Caller holds _guard.
+        start = self._indexed
+        for n, row in enumerate(_book_rows(self.inventory.books, start), start):
+            self._positions.setdefault(row[2], n)
+            self._indexed = n + 1
+
+    def _position(self, isbn: str):
+        i = self._positions.get(isbn)
+        if i is None and self._indexed < len(self.inventory.books):
+            with self._guard:
+                self._index_new_books()
+            i = self._positions.get(isbn)
+        return i
+
+    def _circulate(self, isbn: str, action, kind):
+        i = self._position(isbn)
+        if i is None:
+            raise LookupError("Book not found.")
+        # Indexing inside the lock also keeps lazy materialization atomic,
+        # and events for one ISBN are logged in the order they happened
+        with self._lock_for(isbn):
+            res = action(self.inventory.books[i])
+            if res:
+                self.inventory.record_events([(kind, isbn)])
+        if res:
+            self._dirty = True
+        return res
+
+    def issue(self, isbn: str):
+        return self._circulate(isbn, Book.issue, ISSUE)
+
+    def return_book(self, isbn: str):
+        return self._circulate(isbn, Book.return_book, RETURN)
+
+    def add_book(self, book: Book):
+        for name in _FIELDS[:3]:
+            check_text(name, getattr(book, name))
+        with self._guard:
+            self._index_new_books()
+            if book.isbn in self._positions:
+                raise ValueError("A book with this ISBN already exists!")
+            self.inventory.books.append(book)
+            self._positions[book.isbn] = len(self.inventory.books) - 1
+            self._indexed = len(self.inventory.books)
+        self._dirty = True
+
+    def find(self, isbn: str):
+        i = self._position(isbn)
+        if i is None:
+            return None
+        with self._lock_for(isbn):
+            return self.inventory.books[i]
+
+    def flush(self):
+        with self._save_lock:
+            if not self._dirty:
+                return False
+            self._dirty = False
+            self.inventory.save()
+            return True
+
+    def handle(self, line: str):
+        """Run one text command: ISSUE <isbn>, RETURN <isbn> or FIND <isbn>."""
+        cmd, _, isbn = line.strip().partition(" ")
+        cmd, isbn = cmd.upper(), isbn.strip()
+        try:
+            if cmd == "ISSUE":
+                return "OK" if self.issue(isbn) else "NO already issued"
+            if cmd == "RETURN":
+                return "OK" if self.return_book(isbn) else "NO already available"
+            if cmd == "FIND":
+                b = self.find(isbn)
+                return f"OK {b}" if b else "ERR Book not found."
+            return "ERR Unknown command."
+        except LookupError as e:
+            return f"ERR {e}"
+
+
+async def handle_desk(service: CirculationService, reader, writer):
+    try:
+        while True:
+            line = await reader.readline()
+            if not line or line.strip().upper() == b"QUIT":
+                break
+            writer.write((service.handle(line.decode("utf-8")) + "\n").encode("utf-8"))
+            await writer.drain()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def start_service(service: CirculationService, host="127.0.0.1", port=8765):
+    return await asyncio.start_server(
+        lambda r, w: handle_desk(service, r, w), host, port)
+
+
+async def serve(json_path=None, host="127.0.0.1", port=8765,
+                flush_every: float = 1.0):
+    service = CirculationService(LibraryInventory(json_path or default_catalog(), lazy=True))
+    server = await start_service(service, host, port)
+    logging.info("Circulation service listening on %s:%d", host, port)
+    try:
+        async with server:
+            while True:
+                await asyncio.sleep(flush_every)
+                # Saving rewrites the whole catalogue; keep it off the loop.
+                await asyncio.to_thread(service.flush)
+    finally:
+        await asyncio.to_thread(service.flush)
+
+
+# ---------------------------------------------------------
+# Load Test / Benchmarks
+# ---------------------------------------------------------
+async def _desk_client(port, isbns, ops, seed, tally):
+    rnd = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for _ in range(ops):
+        isbn = rnd.choice(isbns)
+        cmd = rnd.choice(("ISSUE", "RETURN"))
+        writer.write(f"{cmd} {isbn}\n".encode())
+        await writer.drain()
+        if (await reader.readline()).startswith(b"OK"):
+            tally[isbn] += 1 if cmd == "ISSUE" else -1
+    writer.write(b"QUIT\n")
+    writer.close()
+
+
+def _check_no_lost_updates(service, isbns, tally):
+    # Starting from "available", successful issues minus successful
+    # returns must equal the final state of every book.
+    for isbn in isbns:
+        issued = 0 if service.find(isbn).is_available() else 1
+        if tally[isbn] != issued:
+            return False
+    return True
+
+
+async def _socket_round(clients, ops, n_books):
+    inv = LibraryInventory("load_test.json", history=False)
+    inv.books = [Book(f"Book {i}", "Load Test", f"LT-{i}") for i in range(n_books)]
+    service = CirculationService(inv)
+    server = await start_service(service, port=0)
+    port = server.sockets[0].getsockname()[1]
+    isbns = [b.isbn for b in inv.books]
+    tally = dict.fromkeys(isbns, 0)
+    start = time.perf_counter()
+    async with server:
+        await asyncio.gather(*(_desk_client(port, isbns, ops, seed, tally)
+                               for seed in range(clients)))
+        # Let the server-side desk handlers finish closing too.
+        await asyncio.gather(*(asyncio.all_tasks() - {asyncio.current_task()}))
+    elapsed = time.perf_counter() - start
+    return clients * ops / elapsed, _check_no_lost_updates(service, isbns, tally)
+
+
+def _thread_round(threads, ops, n_books):
+    inv = LibraryInventory("load_test.json", history=False)
+    inv.books = [Book(f"Book {i}", "Load Test", f"LT-{i}") for i in range(n_books)]
+    service = CirculationService(inv)
+    isbns = [b.isbn for b in inv.books]
+    tallies = []
+
+    def worker(seed):
+        rnd = random.Random(seed)
+        tally = dict.fromkeys(isbns, 0)
+        for _ in range(ops):
+            isbn = rnd.choice(isbns)
+            if rnd.random() < 0.5:
+                tally[isbn] += service.issue(isbn)
+            else:
+                tally[isbn] -= service.return_book(isbn)
+        tallies.append(tally)
+
+    workers = [threading.Thread(target=worker, args=(s,)) for s in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    total = {isbn: sum(t[isbn] for t in tallies) for isbn in isbns}
+    return threads * ops / elapsed, _check_no_lost_updates(service, isbns, total)
+
+
+def run_load_test(client_counts=(1, 2, 4, 8, 16, 32), ops=2000, n_books=20):
+    """Hammer a few hot books from many desks and report ops/s.
+
+    Nothing is written to disk; the in-memory catalogue is checked for
+    lost updates after each round.
+    """
+    print(f"{'Clients':<10}{'Socket ops/s':>15}{'Thread ops/s':>15}  Consistent")
+    for n in client_counts:
+        sock_rate, sock_ok = asyncio.run(_socket_round(n, ops, n_books))
+        thread_rate, thread_ok = _thread_round(n, ops, n_books)
+        ok = "yes" if sock_ok and thread_ok else "NO"
+        print(f"{n:<10}{sock_rate:>15.0f}{thread_rate:>15.0f}  {ok}")
+
+
+def run_search_benchmark(n_books=1_000_000, n_queries=300, seed=1):
+    """Time fuzzy_search on a synthetic catalogue with one-typo queries."""
+    rnd = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(rnd.choice(letters) for _ in range(rnd.randint(3, 9)))
+             for _ in range(20000)]
+    names = [w.title() for w in words[:3000]]
+    inv = LibraryInventory("search_benchmark.json", history=False)
+    inv.books = [Book(" ".join(rnd.choice(words) for _ in range(rnd.randint(2, 6))).title(),
+                      f"{rnd.choice(names)} {rnd.choice(names)}", str(i))
+                 for i in range(n_books)]
+
+    start = time.perf_counter()
+    inv.fuzzy_search("warm up")
+    print(f"Index build: {time.perf_counter() - start:.1f}s for {n_books} books")
+
+    latencies, found = [], 0
+    for _ in range(n_queries):
+        target = rnd.choice(inv.books)
+        chars = list(target.title.lower())
+        chars[rnd.randrange(len(chars))] = rnd.choice(letters)
+        start = time.perf_counter()
+        results = inv.fuzzy_search("".join(chars))
+        latencies.append(time.perf_counter() - start)
+        found += any(b is target for b, _ in results)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"Query latency: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+    print(f"Target in top 10: {found}/{n_queries}")
+
+
+def _time_cold_load(path: str, lazy: bool):
+    """Runs in a fresh interpreter; prints load seconds and peak RSS in MB."""
+    import resource
+    start = time.perf_counter()
+    inv = LibraryInventory(path, lazy=lazy, history=False)
+    elapsed = time.perf_counter() - start
+    inv.search_by_isbn("0")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{elapsed:.3f} {peak:.0f}")
+
+
+def run_load_benchmark(n_books=1_000_000, seed=1):
+    """Compare cold-start time and peak RSS for JSON vs snapshot, eager vs lazy.
+
+    Each load runs in its own interpreter so peak RSS isn't shared.
+    """
+    import subprocess
+    import tempfile
+    rnd = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(rnd.choice(letters) for _ in range(rnd.randint(3, 9)))
+             for _ in range(20000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        inv = LibraryInventory(Path(tmp, "catalog.json"), history=False)
+        inv.books = [Book(" ".join(rnd.choice(words) for _ in range(rnd.randint(2, 6))).title(),
+                          f"{rnd.choice(words).title()} {rnd.choice(words).title()}", str(i),
+                          "issued" if i % 7 == 0 else "available")
+                     for i in range(n_books)]
+        inv.save()
+        inv.json_path = Path(tmp, "catalog" + SNAPSHOT_SUFFIX)
+        inv.save()
+        del inv
+
+        print(f"Cold start, {n_books} books")
+        print(f"{'Format':<20}{'Seconds':>10}{'Peak RSS (MB)':>16}")
+        for name in ("catalog.json", "catalog" + SNAPSHOT_SUFFIX):
+            for lazy in (False, True):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--bench-load-child",
+                     str(Path(tmp, name)), "lazy" if lazy else "eager"],
+                    capture_output=True, text=True, check=True).stdout.split()
+                label = f"{Path(name).suffix[1:]}, {'lazy' if lazy else 'eager'}"
+                print(f"{label:<20}{float(out[0]):>10.2f}{float(out[1]):>16.0f}")
 
 
 # ---------------------------------------------------------
 # CLI Helper Functions
 # ---------------------------------------------------------
+def default_catalog():
+    """catalog.snap once it has been created (see --to-snapshot), else catalog.json."""
+    snap = Path("catalog" + SNAPSHOT_SUFFIX)
+    return str(snap) if snap.exists() else "catalog.json"
+
+
+def convert_catalog(src: str, dst: str):
+    """Rewrite a catalogue in the format given by dst's suffix; returns the book count."""
+    inv = LibraryInventory(src, lazy=True, history=False)
+    inv.json_path = Path(dst)
+    inv.save()
+    return len(inv.books)
+
+
 def input_nonempty(prompt: str):
     while True:
         v = input(prompt).strip()
@@ -119,7 +1009,11 @@ def input_nonempty(prompt: str):
 # ---------------------------------------------------------
 def menu():
     logging.basicConfig(level=logging.INFO)
-    inv = LibraryInventory("catalog.json")
+    try:
+        inv = LibraryInventory(default_catalog(), lazy=True)
+    except ValueError as e:
+        print("Error:", e)
+        return
 
     while True:
         print("\n=== Library Inventory Manager ===")
@@ -128,9 +1022,12 @@ def menu():
         print("3. Return Book")
         print("4. View All Books")
         print("5. Search Books")
-        print("6. Exit")
+        print("6. Import Books from File")
+        print("7. Export Books to File")
+        print("8. Circulation Reports")
+        print("9. Exit")
 
-        choice = input("Enter option (1-6): ").strip()
+        choice = input("Enter option (1-9): ").strip()
 
         try:
             if choice == "1":
@@ -163,7 +1060,7 @@ def menu():
                         print(b)
 
             elif choice == "5":
-                mode = input("Search by (t)itle or (i)sbn? ").strip().lower()
+                mode = input("Search by (t)itle, (f)uzzy title/author or (i)sbn? ").strip().lower()
                 if mode == "t":
                     q = input_nonempty("Title: ")
                     results = inv.search_by_title(q)
@@ -173,6 +1070,15 @@ def menu():
                     else:
                         print("No matching books found.")
 
+                elif mode == "f":
+                    q = input_nonempty("Title or author: ")
+                    results = inv.fuzzy_search(q)
+                    if results:
+                        for b, score in results:
+                            print(f"{b}  [{score:.0%} match]")
+                    else:
+                        print("No matching books found.")
+
                 elif mode == "i":
                     isbn = input_nonempty("ISBN: ")
                     b = inv.search_by_isbn(isbn)
@@ -182,11 +1088,37 @@ def menu():
                     print("Invalid search type.")
 
             elif choice == "6":
+                path = input_nonempty("CSV / JSON-lines file: ")
+                added, skipped = inv.import_books(path)
+                print(f"✔ {added} book(s) imported.")
+                for line, reason in skipped[:20]:
+                    print(f"✖ Line {line} skipped: {reason}")
+                if len(skipped) > 20:
+                    print(f"✖ ... and {len(skipped) - 20} more skipped.")
+
+            elif choice == "7":
+                path = input_nonempty("Export to (.csv / .jsonl): ")
+                count = inv.export_books(path)
+                print(f"✔ {count} book(s) exported.")
+
+            elif choice == "8":
+                log = inv.history
+                print("Most borrowed (last 30 days):")
+                top = log.most_borrowed(k=10, days=30)
+                if not top:
+                    print("  No loans recorded.")
+                for isbn, count in top:
+                    b = inv.search_by_isbn(isbn)
+                    print(f"  {count:>4}  {b.title if b else isbn}")
+                print(f"Average loan duration: {log.average_loan_days():.1f} days")
+                print(f"Utilization (last 30 days): {log.utilization(len(inv.books)):.1%}")
+
+            elif choice == "9":
                 print("Goodbye!")
                 break
 
             else:
-                print("Invalid option. Enter 1–6.")
+                print("Invalid option. Enter 1–9.")
 
         except Exception as e:
             print("Error:", e)
@@ -196,4 +1128,24 @@ def menu():
 # Entry Point
 # ---------------------------------------------------------
 if __name__ == "__main__":
-    menu()
+    if "--serve" in sys.argv:
+        logging.basicConfig(level=logging.INFO)
+        asyncio.run(serve())
+    elif "--to-snapshot" in sys.argv:
+        dst = "catalog" + SNAPSHOT_SUFFIX
+        if not Path("catalog.json").exists():
+            print("Error: catalog.json not found.")
+        else:
+            count = convert_catalog("catalog.json", dst)
+            print(f"✔ {count} book(s) written to {dst}; it is used instead of catalog.json from now on.")
+    elif "--load-test" in sys.argv:
+        run_load_test()
+    elif "--bench-search" in sys.argv:
+        run_search_benchmark()
+    elif "--bench-load-child" in sys.argv:
+        i = sys.argv.index("--bench-load-child")
+        _time_cold_load(sys.argv[i + 1], sys.argv[i + 2] == "lazy")
+    elif "--bench-load" in sys.argv:
+        run_load_benchmark()
+    else:
+        menu()